@@ -3,19 +3,18 @@ import copy
 import csv
 import functools
 import gc
-import glob
 import inspect
 import itertools
 import json
 import math
 import os
 import pathlib
-import re
 import shutil
 import sqlite3
 import tempfile
 import threading
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import closing
 from datetime import datetime
 from importlib import metadata
@@ -28,7 +27,6 @@ import orjson
 import pandas as pd
 import yaml
 from datasets import Dataset as HuggingFaceDataset
-from pandas.api.types import is_object_dtype
 from pydantic import BaseModel, SerializeAsAny, field_validator
 from sklearn.preprocessing import PowerTransformer
 from typing_extensions import override
@@ -135,7 +133,6 @@ from .dataset import (
   RAW_SQL_OPS,
   SAMPLE_AVG_TEXT_LENGTH,
   STRING_OPS,
-  TOO_MANY_DISTINCT,
   UNARY_OPS,
   BinaryOp,
   Column,
@@ -187,6 +184,10 @@ SOURCE_VIEW_NAME = 'source'
 SQLITE_LABEL_COLNAME = 'label'
 SQLITE_CREATED_COLNAME = 'created'
 MAX_AUTO_BINS = 15
+# Maximum number of select_groups results kept per dataset, evicted least recently used first.
+SELECT_GROUPS_CACHE_SIZE = 256
+# Number of threads used to read signal and map manifests when recomputing the joint view.
+MANIFEST_READ_MAX_WORKERS = 8
 
 BINARY_OP_TO_SQL: dict[BinaryOp, str] = {
   'equals': '=',
@@ -320,6 +321,9 @@ def _consume_iterator(iterator: Iterator[Any]) -> None:
 
 
 PivotCacheKey = tuple[PathTuple, PathTuple, GroupsSortBy, SortOrder]
+SelectGroupsCacheKey = tuple[
+  PathTuple, GroupsSortBy, SortOrder, Optional[int], Optional[tuple[Union[Bin, float], ...]], bool
+]
 
 
 class DatasetDuckDB(Dataset):
@@ -340,10 +344,9 @@ class DatasetDuckDB(Dataset):
     self._signal_manifests: list[SignalManifest] = []
     self._map_manifests: list[MapManifest] = []
     self._label_schemas: dict[str, Schema] = {}
-    if env('LILAC_USE_TABLE_INDEX', default=False):
-      self.con = duckdb.connect(database=os.path.join(self.dataset_path, DUCKDB_CACHE_FILE))
-    else:
-      self.con = duckdb.connect(database=':memory:')
+    self.con = self._connect()
+    # Holds one cursor on `self.con` per thread, reused across queries from that thread.
+    self._thread_cursors = threading.local()
 
     # Maps a path and embedding to the vector index. This is lazily generated as needed.
     self._vector_indices: dict[tuple[PathKey, str], VectorDBIndex] = {}
@@ -353,8 +356,12 @@ class DatasetDuckDB(Dataset):
     self._vector_index_lock = threading.Lock()
     self._label_file_lock: dict[str, threading.Lock] = defaultdict(threading.Lock)
 
-    # Cache pivot results.
+    # Cache pivot and select groups results.
     self._pivot_cache: dict[PivotCacheKey, PivotResult] = {}
+    self._select_groups_cache: OrderedDict[SelectGroupsCacheKey, SelectGroupsResult] = OrderedDict()
+    self._select_groups_cache_lock = threading.Lock()
+    # Bumped on every invalidation so results computed before a clear are not cached after it.
+    self._select_groups_cache_version = 0
 
     # Create a join table from all the parquet files.
     self.manifest()
@@ -473,6 +480,7 @@ class DatasetDuckDB(Dataset):
     del sqlite_files  # Unused.
 
     self._pivot_cache.clear()
+    self._clear_select_groups_cache()
     self.stats.cache_clear()
 
     merged_schema = self._source_manifest.data_schema.model_copy(deep=True)
@@ -480,22 +488,17 @@ class DatasetDuckDB(Dataset):
     self._label_schemas = {}
     self._map_manifests = []
     # Make a joined view of all the column groups.
-    self._create_view(
-      SOURCE_VIEW_NAME,
-      [os.path.join(self.dataset_path, f) for f in self._source_manifest.files],
-      type='parquet',
-    )
+    source_files = [os.path.join(self.dataset_path, f) for f in self._source_manifest.files]
+    self._create_view(SOURCE_VIEW_NAME, source_files, type='parquet')
 
-    # Walk dataset directory and create views for each data type
+    # Walk dataset directory and create views for each data type. Manifests are collected first and
+    # parsed in parallel since each one is a separate small file read.
+    signal_manifest_filepaths: list[str] = []
+    map_manifest_filepaths: list[str] = []
     for root, _, files in os.walk(self.dataset_path):
       for file in files:
         if file.endswith(SIGNAL_MANIFEST_FILENAME):
-          with open_file(os.path.join(root, file)) as f:
-            signal_manifest = SignalManifest.model_validate_json(f.read())
-          self._signal_manifests.append(signal_manifest)
-          signal_files = [os.path.join(root, f) for f in signal_manifest.files]
-          if signal_files:
-            self._create_view(signal_manifest.parquet_id, signal_files, type='parquet')
+          signal_manifest_filepaths.append(os.path.join(root, file))
         elif file.endswith(LABELS_SQLITE_SUFFIX):
           label_name = file[0 : -len(LABELS_SQLITE_SUFFIX)]
           self._create_view(label_name, [os.path.join(root, file)], type='sqlite')
@@ -512,12 +515,27 @@ class DatasetDuckDB(Dataset):
             }
           )
         elif file.endswith(MAP_MANIFEST_SUFFIX):
-          with open_file(os.path.join(root, file)) as f:
-            map_manifest = MapManifest.model_validate_json(f.read())
-          map_files = [os.path.join(root, f) for f in map_manifest.files]
-          self._create_view(map_manifest.parquet_id, map_files, type='parquet')
-          if map_files:
-            self._map_manifests.append(map_manifest)
+          map_manifest_filepaths.append(os.path.join(root, file))
+
+    with ThreadPoolExecutor(max_workers=MANIFEST_READ_MAX_WORKERS) as executor:
+      signal_manifests = list(executor.map(_read_signal_manifest, signal_manifest_filepaths))
+      map_manifests = list(executor.map(_read_map_manifest, map_manifest_filepaths))
+
+    for signal_manifest_filepath, signal_manifest in zip(
+      signal_manifest_filepaths, signal_manifests
+    ):
+      self._signal_manifests.append(signal_manifest)
+      root = os.path.dirname(signal_manifest_filepath)
+      signal_files = [os.path.join(root, f) for f in signal_manifest.files]
+      if signal_files:
+        self._create_view(signal_manifest.parquet_id, signal_files, type='parquet')
+
+    for map_manifest_filepath, map_manifest in zip(map_manifest_filepaths, map_manifests):
+      root = os.path.dirname(map_manifest_filepath)
+      map_files = [os.path.join(root, f) for f in map_manifest.files]
+      self._create_view(map_manifest.parquet_id, map_files, type='parquet')
+      if map_files:
+        self._map_manifests.append(map_manifest)
 
     merged_schema = merge_schemas(
       [self._source_manifest.data_schema]
@@ -534,21 +552,17 @@ class DatasetDuckDB(Dataset):
     #   FROM source JOIN "parquet_id1" USING (rowid,) JOIN "parquet_id2" USING (rowid,)
     # );
     # NOTE: "root_column" for each signal is defined as the top-level column.
-    signal_column_selects = [
-      (
-        f'{escape_col_name(manifest.parquet_id)}.{escape_col_name(_root_column(manifest))} '
-        f'AS {escape_col_name(manifest.parquet_id)}'
-      )
-      for manifest in self._signal_manifests
-      if manifest.files
+    # Signals and maps with parquet files, walked once to build both the select and join clauses.
+    manifests: list[Union[SignalManifest, MapManifest]] = [
+      *self._signal_manifests,
+      *self._map_manifests,
     ]
-    map_column_selects = [
-      (
-        f'{escape_col_name(manifest.parquet_id)}.{escape_col_name(_root_column(manifest))} '
-        f'AS {escape_col_name(manifest.parquet_id)}'
-      )
-      for manifest in self._map_manifests
-      if manifest.files
+    parquet_manifests = [manifest for manifest in manifests if manifest.files]
+    parquet_ids = [manifest.parquet_id for manifest in parquet_manifests]
+    parquet_column_selects = [
+      f'{escape_col_name(manifest.parquet_id)}.{escape_col_name(_root_column(manifest))} '
+      f'AS {escape_col_name(manifest.parquet_id)}'
+      for manifest in parquet_manifests
     ]
     label_column_selects = []
     for label_name in self._label_schemas.keys():
@@ -574,16 +588,7 @@ class DatasetDuckDB(Dataset):
         "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = 't'"
       ).fetchone()[0]  # type: ignore
       if db_mtime != latest_mtime_micro_sec or not table_exists:
-        table_select_sql = ', '.join(
-          [f'{SOURCE_VIEW_NAME}.*'] + signal_column_selects + map_column_selects
-        )
-
-        # Get parquet ids for signals, maps
-        parquet_ids = [
-          manifest.parquet_id
-          for manifest in self._signal_manifests + self._map_manifests
-          if manifest.files
-        ]
+        table_select_sql = ', '.join([f'{SOURCE_VIEW_NAME}.*'] + parquet_column_selects)
         table_join_sql = ' '.join(
           [SOURCE_VIEW_NAME]
           + [
@@ -612,30 +617,23 @@ class DatasetDuckDB(Dataset):
 
     else:
       select_sql = ', '.join(
-        [f'{SOURCE_VIEW_NAME}.*']
-        + signal_column_selects
-        + map_column_selects
-        + label_column_selects
+        [f'{SOURCE_VIEW_NAME}.*'] + parquet_column_selects + label_column_selects
       )
 
-      # Get parquet ids for signals, maps, and labels.
-      parquet_ids = [
-        manifest.parquet_id
-        for manifest in self._signal_manifests + self._map_manifests
-        if manifest.files
-      ] + list(self._label_schemas.keys())
+      # Join the signals, maps, and labels.
+      join_ids = parquet_ids + list(self._label_schemas.keys())
       join_sql = ' '.join(
         [SOURCE_VIEW_NAME]
-        + [f'LEFT JOIN {escape_col_name(parquet_id)} USING ({ROWID})' for parquet_id in parquet_ids]
+        + [f'LEFT JOIN {escape_col_name(join_id)} USING ({ROWID})' for join_id in join_ids]
       )
       sql_cmd = f"""
         CREATE OR REPLACE VIEW t AS (SELECT {select_sql} FROM {join_sql})
       """
       self.con.execute(sql_cmd)
-    # Get the total size of the table.
-    size_query = 'SELECT COUNT() as count FROM t'
-    size_query_result = cast(Any, self._query(size_query)[0])
-    num_items = cast(int, size_query_result[0])
+    # Get the total size of the table. Every other view is left joined onto the source by rowid, so
+    # this is the row count of the source files, which is read from the parquet footers.
+    size_query = f'SELECT SUM(num_rows) FROM parquet_file_metadata({source_files})'
+    num_items = int(self._query(size_query)[0][0] or 0)
 
     for path, field in merged_schema.leafs.items():
       if field.dtype and field.dtype.type == 'map':
@@ -662,6 +660,7 @@ class DatasetDuckDB(Dataset):
     """Clears the cache for the joint table."""
     self._recompute_joint_table.cache_clear()
     self._pivot_cache.clear()
+    self._clear_select_groups_cache()
     self.stats.cache_clear()
     if env('LILAC_USE_TABLE_INDEX', default=False):
       self.con.close()
@@ -669,7 +668,19 @@ class DatasetDuckDB(Dataset):
       pathlib.Path(os.path.join(self.dataset_path, DUCKDB_CACHE_FILE + '.wal')).unlink(
         missing_ok=True
       )
-      self.con = duckdb.connect(database=os.path.join(self.dataset_path, DUCKDB_CACHE_FILE))
+      self.con = self._connect()
+      self._thread_cursors = threading.local()
+
+  def _connect(self) -> duckdb.DuckDBPyConnection:
+    """Connects to the DuckDB database that holds the joint views over the dataset files."""
+    if env('LILAC_USE_TABLE_INDEX', default=False):
+      con = duckdb.connect(database=os.path.join(self.dataset_path, DUCKDB_CACHE_FILE))
+    else:
+      con = duckdb.connect(database=':memory:')
+    # Cache parquet metadata across queries so every query on the views doesn't re-read and parse
+    # the footers of every parquet file. DuckDB re-validates the cache against the file mtime.
+    con.execute('SET enable_object_cache=true')
+    return con
 
   def _add_map_keys_to_schema(self, path: PathTuple, field: Field, merged_schema: Schema) -> None:
     """Adds the keys of a map to the schema."""
@@ -680,9 +691,9 @@ class DatasetDuckDB(Dataset):
     )
     query = f"""
       SELECT DISTINCT unnest(map_keys({inner_select})) AS {value_column} FROM t
+      ORDER BY {value_column}
     """
-    df = self._query_df(query)
-    keys: list[str] = sorted(df[value_column])
+    keys: list[str] = [key for (key,) in self._query(query)]
 
     map_dtype = cast(MapType, field.dtype)
     field.fields = field.fields or {}
@@ -694,13 +705,16 @@ class DatasetDuckDB(Dataset):
     # Use the latest modification time of all files under the dataset path as the cache key for
     # re-computing the manifest and the joined view.
     with self._manifest_lock:
-      all_dataset_files = glob.iglob(os.path.join(self.dataset_path, '**'), recursive=True)
-      all_dataset_files = (f for f in all_dataset_files if DUCKDB_CACHE_FILE not in f)
-      all_dataset_files = (f for f in all_dataset_files if os.path.isfile(f))
-      rapid_change, slow_change = itertools.tee(all_dataset_files)
-      rapid_change = (f for f in rapid_change if f.endswith(LABELS_SQLITE_SUFFIX))
-      slow_change = (f for f in slow_change if not f.endswith(LABELS_SQLITE_SUFFIX))
-      latest_mtime = max(map(os.path.getmtime, slow_change))
+      rapid_change: list[str] = []
+      slow_change_mtimes: list[float] = []
+      for entry in _scan_files(self.dataset_path):
+        if DUCKDB_CACHE_FILE in entry.path:
+          continue
+        if entry.name.endswith(LABELS_SQLITE_SUFFIX):
+          rapid_change.append(entry.path)
+        else:
+          slow_change_mtimes.append(entry.stat().st_mtime)
+      latest_mtime = max(slow_change_mtimes)
       latest_mtime_micro_sec = int(latest_mtime * 1e6)
       try:
         return self._recompute_joint_table(latest_mtime_micro_sec, tuple(sorted(rapid_change)))
@@ -726,9 +740,13 @@ class DatasetDuckDB(Dataset):
       self.con.execute(f'SELECT COUNT(*) FROM (SELECT {ROWID} from t {option_sql})').fetchone(),
     )[0]
 
-  def _get_vector_db_index(self, embedding: str, path: PathTuple) -> VectorDBIndex:
-    # Refresh the manifest to make sure we have the latest signal manifests.
-    self.manifest()
+  def _get_vector_db_index(
+    self, embedding: str, path: PathTuple, refresh_manifest: bool = True
+  ) -> VectorDBIndex:
+    # Refresh the manifest to make sure we have the latest signal manifests. Callers that already
+    # hold a fresh manifest skip this to avoid re-scanning the dataset directory.
+    if refresh_manifest:
+      self.manifest()
     index_key = (path, embedding)
     with self._vector_index_lock:
       if index_key in self._vector_indices:
@@ -1160,7 +1178,7 @@ class DatasetDuckDB(Dataset):
       raise ValueError('Signal already exists. Use overwrite=True to overwrite.')
 
     if isinstance(signal, VectorSignal):
-      self._assert_embedding_exists(input_path, signal.embedding)
+      self._assert_embedding_exists(input_path, signal.embedding, manifest)
 
     # Update the project config before computing the signal.
     add_project_signal_config(
@@ -1795,29 +1813,27 @@ class DatasetDuckDB(Dataset):
       if row[0] is not None:
         avg_text_length = int(row[0])
 
-    total_count_query = (
-      f'SELECT count(val) FROM (SELECT {inner_select} as val FROM t {where_clause})'
-    )
-    total_count = int(self._query(total_count_query)[0][0])
-
-    # Compute approximate count by sampling the data to avoid OOM.
+    # Compute the count, approximate distinct count and min/max values in a single scan. The
+    # distinct count is a HyperLogLog sketch, so it uses constant memory over the full column.
+    aggregates = ['count(val)']
+    approx_count_distinct: Optional[int] = None
     if avg_text_length and avg_text_length > MAX_TEXT_LEN_DISTINCT_COUNT:
       # Assume that every text field is unique.
       approx_count_distinct = manifest.num_items
     elif leaf.dtype == BOOLEAN:
       approx_count_distinct = 2
     else:
-      sample_size = TOO_MANY_DISTINCT
-      approx_count_query = f"""
-        SELECT approx_count_distinct(val) as approxCountDistinct
-        FROM (SELECT {inner_select} AS val FROM t {where_clause}) USING SAMPLE {sample_size};
-      """
-      row = self._query(approx_count_query)[0]
-      approx_count_distinct = int(row[0])
-
-      # Adjust the counts for the sample size.
-      factor = max(1, total_count / sample_size)
-      approx_count_distinct = round(approx_count_distinct * factor)
+      aggregates.append('approx_count_distinct(val)')
+    if is_ordinal(leaf.dtype):
+      nan_filter = ' FILTER (WHERE NOT isnan(val))' if is_float(leaf.dtype) else ''
+      aggregates.extend([f'MIN(val){nan_filter}', f'MAX(val){nan_filter}'])
+    stats_query = f"""
+      SELECT {', '.join(aggregates)}
+      FROM (SELECT {inner_select} AS val FROM t {where_clause})
+    """
+    total_count, *aggregate_row = self._query(stats_query)[0]
+    if approx_count_distinct is None:
+      approx_count_distinct, *aggregate_row = aggregate_row
 
     result = StatsResult(
       path=path,
@@ -1826,15 +1842,8 @@ class DatasetDuckDB(Dataset):
       avg_text_length=avg_text_length,
     )
 
-    # Compute min/max values for ordinal leafs, without sampling the data.
     if is_ordinal(leaf.dtype):
-      min_max_query = f"""
-        SELECT MIN(val) AS minVal, MAX(val) AS maxVal,
-        FROM (SELECT {inner_select} as val FROM t {where_clause})
-        {'WHERE NOT isnan(val)' if is_float(leaf.dtype) else ''}
-      """
-      row = self._query(min_max_query)[0]
-      result.min_val, result.max_val = row
+      result.min_val, result.max_val = aggregate_row
       if is_temporal(leaf.dtype):
         sample_where_clause = ''
       else:
@@ -1869,6 +1878,25 @@ class DatasetDuckDB(Dataset):
     sort_order = sort_order or SortOrder.DESC
     path = normalize_path(leaf_path)
     manifest = self.manifest()
+
+    # Bins may be given as lists (e.g. from JSON), so convert each one to a tuple for the key.
+    bins_key: Optional[tuple[Union[Bin, float], ...]] = (
+      tuple(b if isinstance(b, (float, int)) else cast(Bin, tuple(b)) for b in bins)
+      if bins
+      else None
+    )
+    groups_key: SelectGroupsCacheKey = (path, sort_by, sort_order, limit, bins_key, include_deleted)
+    # Labels are edited without invalidating the manifest, so groups over labels are not cached.
+    use_cache = not filters and not searches and path[0] not in self._label_schemas
+    cache_version = 0
+    if use_cache:
+      with self._select_groups_cache_lock:
+        cache_version = self._select_groups_cache_version
+        cached_result = self._select_groups_cache.get(groups_key)
+        if cached_result is not None:
+          self._select_groups_cache.move_to_end(groups_key)
+          return cached_result
+
     leaf = manifest.data_schema.get_field(path)
     # Find the inner-most leaf in case this field is repeated.
     while leaf.repeated_field:
@@ -1888,44 +1916,41 @@ class DatasetDuckDB(Dataset):
     outer_select = inner_val
     # Normalize the bins to be `list[Bin]`.
     named_bins = _normalize_bins(bins or leaf.bins)
-    stats = self.stats(leaf_path, include_deleted=include_deleted)
 
     leaf_is_float = is_float(leaf.dtype)
     leaf_is_integer = is_integer(leaf.dtype)
     if not leaf.categorical and (leaf_is_float or leaf_is_integer):
       if named_bins is None:
         # Auto-bin.
-        named_bins = _auto_bins(stats)
-
-      sql_bounds = []
-      for label, start, end in named_bins:
-        if start is None:
-          start = cast(float, "'-Infinity'::FLOAT")
-        if end is None:
-          end = cast(float, "'Infinity'::FLOAT")
-        sql_bounds.append(f"('{label}', {start}, {end})")
-
-      bin_index_col = 'col0'
-      bin_min_col = 'col1'
-      bin_max_col = 'col2'
-      is_nan_filter = f'NOT isnan({inner_val}) AND' if leaf_is_float else ''
-
-      # We cast the field to `double` so binning works for both `float` and `int` fields.
-      outer_select = f"""(
-        SELECT {bin_index_col} FROM (
-          VALUES {', '.join(sql_bounds)}
-        ) WHERE {is_nan_filter}
-           {inner_val}::DOUBLE >= {bin_min_col} AND {inner_val}::DOUBLE < {bin_max_col}
-      )"""
+        named_bins = _auto_bins(self.stats(leaf_path, include_deleted=include_deleted))
+
+      outer_select = _bins_case_sql(f'{inner_val}::DOUBLE', named_bins, leaf_is_float)
     else:
-      if stats.approx_count_distinct >= dataset.TOO_MANY_DISTINCT:
-        return SelectGroupsResult(too_many_distinct=True, counts=[], bins=named_bins)
+      # A non-repeated leaf has at most one value per row, so the row count from the manifest bounds
+      # the number of distinct values and we can skip computing stats.
+      may_have_too_many_distinct = (
+        PATH_WILDCARD in path or manifest.num_items >= dataset.TOO_MANY_DISTINCT
+      )
+      if (
+        may_have_too_many_distinct
+        and self.stats(leaf_path, include_deleted=include_deleted).approx_count_distinct
+        >= dataset.TOO_MANY_DISTINCT
+      ):
+        result = SelectGroupsResult(too_many_distinct=True, counts=[], bins=named_bins)
+        if use_cache:
+          self._cache_select_groups(groups_key, result, cache_version)
+        return result
 
     count_column = GroupsSortBy.COUNT.value
     value_column = GroupsSortBy.VALUE.value
 
-    limit_query = f'LIMIT {limit}' if limit else ''
-    duckdb_path = self._leaf_path_to_duckdb_path(path, manifest.data_schema)
+    # The distinct count from `stats` is approximate, so without a user limit we cap the groups at
+    # one over the threshold and detect the overflow from the result size.
+    too_many_distinct = dataset.TOO_MANY_DISTINCT
+    limit_query = f'LIMIT {limit}' if limit else f'LIMIT {too_many_distinct + 1}'
+    [(parquet_id, duckdb_path), *_] = self._column_to_duckdb_paths(
+      Column(path), manifest.data_schema, combine_columns=False
+    )
     inner_select = self._select_sql(
       duckdb_path,
       flatten=True,
@@ -1947,20 +1972,50 @@ class DatasetDuckDB(Dataset):
     if filter_queries:
       where_query = f"WHERE {' AND '.join(filter_queries)}"
 
+    # Without filters, source columns are grouped straight off the source parquet view. Skipping
+    # the joins in `t` lets DuckDB aggregate dictionary-encoded parquet pages (e.g. low-cardinality
+    # strings) without first materializing every value.
+    from_table = SOURCE_VIEW_NAME if parquet_id == 'source' and not filter_queries else 't'
+
     query = f"""
       SELECT {outer_select} AS {value_column}, COUNT() AS {count_column}
-      FROM (SELECT {inner_select} AS {inner_val} FROM t {where_query})
+      FROM (SELECT {inner_select} AS {inner_val} FROM {from_table} {where_query})
       GROUP BY {value_column}
       ORDER BY {sort_by.value} {sort_order.value}, {value_column}
       {limit_query}
     """
-    df = self._query_df(query)
-    counts = list(df.itertuples(index=False, name=None))
-    if is_temporal(leaf.dtype):
-      # Replace any NaT with None and pd.Timestamp to native datetime objects.
-      counts = [(None if pd.isnull(val) else val.to_pydatetime(), count) for val, count in counts]
+    # Fetch the tuples directly so values come back as native python objects (e.g. `datetime`).
+    counts = self._query(query)
+    if not limit and len(counts) > too_many_distinct:
+      result = SelectGroupsResult(too_many_distinct=True, counts=[], bins=named_bins)
+    else:
+      result = SelectGroupsResult(too_many_distinct=False, counts=counts, bins=named_bins)
+
+    if use_cache:
+      self._cache_select_groups(groups_key, result, cache_version)
+    return result
+
+  def _cache_select_groups(
+    self, key: SelectGroupsCacheKey, result: SelectGroupsResult, cache_version: int
+  ) -> None:
+    """Stores a select_groups result, evicting the least recently used one when full.
 
-    return SelectGroupsResult(too_many_distinct=False, counts=counts, bins=named_bins)
+    The result is dropped if the cache was cleared after `cache_version` was read, since it may
+    have been computed from data that has changed since.
+    """
+    with self._select_groups_cache_lock:
+      if cache_version != self._select_groups_cache_version:
+        return
+      self._select_groups_cache[key] = result
+      self._select_groups_cache.move_to_end(key)
+      if len(self._select_groups_cache) > SELECT_GROUPS_CACHE_SIZE:
+        self._select_groups_cache.popitem(last=False)
+
+  def _clear_select_groups_cache(self) -> None:
+    """Removes all cached select_groups results."""
+    with self._select_groups_cache_lock:
+      self._select_groups_cache.clear()
+      self._select_groups_cache_version += 1
 
   @override
   def pivot(
@@ -2067,9 +2122,8 @@ class DatasetDuckDB(Dataset):
       GROUP BY out_val
       ORDER BY {sort_by.value} {sort_order.value}, {value_column}
     """
-    df = self._query_df(query)
     outer_groups: list[PivotResultOuterGroup] = []
-    for out_val, count, inner_structs in df.itertuples(index=False, name=None):
+    for out_val, count, inner_structs in self._query(query):
       inner: list[tuple[Optional[str], int]] = [
         (struct[value_column], struct[count_column]) for struct in inner_structs
       ]
@@ -2271,16 +2325,19 @@ class DatasetDuckDB(Dataset):
       rowids: Optional[list[str]] = None
       if where_query:
         # If there are filters, we need to send rowids to the top k query.
-        df = con.execute(f'SELECT {ROWID} FROM t {where_query}').df()
-        total_num_rows = len(df)
-        rowids = [rowid for rowid in df[ROWID]]
+        rowids = [
+          rowid for (rowid,) in con.execute(f'SELECT {ROWID} FROM t {where_query}').fetchall()
+        ]
+        total_num_rows = len(rowids)
 
       if rowids is not None and len(rowids) == 0:
         where_query = 'WHERE false'
       else:
         topk_signal = cast(VectorSignal, topk_udf_col.signal_udf)
         # The input is an embedding.
-        vector_index = self._get_vector_db_index(topk_signal.embedding, topk_udf_col.path)
+        vector_index = self._get_vector_db_index(
+          topk_signal.embedding, topk_udf_col.path, refresh_manifest=False
+        )
         k = (limit or 0) + offset
         path_id = f'{self.namespace}/{self.dataset_name}:{topk_udf_col.path}'
         with DebugTimer(
@@ -2434,7 +2491,8 @@ class DatasetDuckDB(Dataset):
           f'{len(temp_signal_cols)} underlying columns that contain data related to {udf_col.path}.'
         )
       signal_column = list(temp_signal_cols.keys())[0]
-      input = df[signal_column]
+      # Iterate plain lists rather than the Series to avoid per-element pandas boxing.
+      input = df[signal_column].tolist()
 
       path_id = f'{self.namespace}/{self.dataset_name}:{udf_col.path}'
       with DebugTimer(f'Computing signal "{signal.name}" on {path_id}'):
@@ -2442,10 +2500,12 @@ class DatasetDuckDB(Dataset):
 
         if isinstance(signal, VectorSignal):
           embedding_signal = signal
-          self._assert_embedding_exists(udf_col.path, embedding_signal.embedding)
+          self._assert_embedding_exists(udf_col.path, embedding_signal.embedding, manifest)
 
-          vector_store = self._get_vector_db_index(embedding_signal.embedding, udf_col.path)
-          flat_keys = flatten_keys(df[ROWID], input)
+          vector_store = self._get_vector_db_index(
+            embedding_signal.embedding, udf_col.path, refresh_manifest=False
+          )
+          flat_keys = flatten_keys(df[ROWID].tolist(), input)
           signal_out = sparse_to_dense_compute(
             flat_keys, lambda keys: embedding_signal.vector_compute(vector_store.get(keys))
           )
@@ -2459,7 +2519,7 @@ class DatasetDuckDB(Dataset):
           signal_out_list = list(signal_out)
           if signal_column in temp_column_to_offset_column:
             offset_column_name, field = temp_column_to_offset_column[signal_column]
-            nested_spans: Iterable[Item] = df[offset_column_name]
+            nested_spans: Iterable[Item] = df[offset_column_name].tolist()
             flat_spans = flatten_iter(nested_spans)
             for text_span, item in zip(flat_spans, signal_out_list):
               _offset_any_span(cast(int, text_span[SPAN_KEY][TEXT_SPAN_START_FEATURE]), item, field)
@@ -2674,6 +2734,7 @@ class DatasetDuckDB(Dataset):
     if num_labels > 0 and name == DELETED_LABEL_NAME:
       self.stats.cache_clear()
       self._pivot_cache.clear()
+      self._clear_select_groups_cache()
 
     return num_labels
 
@@ -2738,6 +2799,7 @@ class DatasetDuckDB(Dataset):
     if remove_row_ids and name == DELETED_LABEL_NAME:
       self.stats.cache_clear()
       self._pivot_cache.clear()
+      self._clear_select_groups_cache()
 
     return len(remove_row_ids)
 
@@ -3062,9 +3124,7 @@ class DatasetDuckDB(Dataset):
 
   def _execute(self, query: str) -> duckdb.DuckDBPyConnection:
     """Execute a query in duckdb."""
-    # FastAPI is multi-threaded so we have to create a thread-specific connection cursor to allow
-    # these queries to be thread-safe.
-    local_con = self.con.cursor()
+    local_con = self._cursor()
     if not env('DEBUG', False):
       return local_con.execute(query)
 
@@ -3074,26 +3134,22 @@ class DatasetDuckDB(Dataset):
     with DebugTimer('Query'):
       return local_con.execute(query)
 
+  def _cursor(self) -> duckdb.DuckDBPyConnection:
+    """Returns the cursor for the current thread, creating it on first use."""
+    # FastAPI is multi-threaded so we have to use a thread-specific connection cursor to allow
+    # these queries to be thread-safe. The cursor is kept and reused for the thread's next query.
+    cursor = getattr(self._thread_cursors, 'cursor', None)
+    if cursor is None:
+      cursor = self.con.cursor()
+      self._thread_cursors.cursor = cursor
+    return cursor
+
   def _query(self, query: str) -> list[tuple]:
-    result = self._execute(query)
-    rows = result.fetchall()
-    result.close()
-    return rows
+    return self._execute(query).fetchall()
 
   def _query_df(self, query: str) -> pd.DataFrame:
     """Execute a query that returns a data frame."""
-    result = self._execute(query)
-    df = _replace_nan_with_none(result.df())
-    result.close()
-    return df
-
-  def _path_to_col(self, path: Path, quote_each_part: bool = True) -> str:
-    """Convert a path to a column name."""
-    if isinstance(path, str):
-      path = (path,)
-    return '.'.join(
-      [f'{escape_col_name(path_comp)}' if quote_each_part else str(path_comp) for path_comp in path]
-    )
+    return _replace_nan_with_none(self._execute(query).df())
 
   def _compile_include_exclude_filters(
     self,
@@ -3506,45 +3562,50 @@ class DatasetDuckDB(Dataset):
         writer.write(row)
       writer.close()
 
-  def _assert_embedding_exists(self, path: PathTuple, embedding: str) -> None:
-    manifest = self.manifest()
+  def _assert_embedding_exists(
+    self, path: PathTuple, embedding: str, manifest: DatasetManifest
+  ) -> None:
     embedding_path = (*path, embedding)
     if not manifest.data_schema.has_field(embedding_path):
       raise ValueError(f'Embedding "{embedding}" not found for path {path}.')
 
   def _inner_select(
     self,
-    sub_paths: list[PathTuple],
+    sub_paths: Sequence[PathTuple],
     path: PathTuple,
     schema: Schema,
-    inner_var: Optional[str] = None,
     empty: bool = False,
     span_from: Optional[PathTuple] = None,
   ) -> str:
-    """Recursively generate the inner select statement for a list of sub paths."""
-    current_sub_path = sub_paths[0]
-    lambda_var = inner_var + 'x' if inner_var else 'x'
-    if not inner_var:
-      lambda_var = 'x'
-      inner_var = escape_col_name(current_sub_path[0])
-      current_sub_path = current_sub_path[1:]
+    """Generate the inner select statement for a list of sub paths.
+
+    Each sub path after the first is a repeated level, selected with a nested `list_transform`.
+    The nested calls are assembled from a list of prefixes in one pass instead of recursively.
+    """
+    # The first sub path starts at a top-level column of the joint table.
+    inner_var = escape_col_name(sub_paths[0][0])
+    current_sub_path = sub_paths[0][1:]
+    lambda_var = 'x'
+    prefixes: list[str] = []
+    for next_sub_path in sub_paths[1:]:
+      path_key = inner_var + _struct_keys_sql(current_sub_path)
+      prefixes.append(f'list_transform({path_key}, {lambda_var} -> ')
+      inner_var, current_sub_path = lambda_var, next_sub_path
+      lambda_var = inner_var + 'x'
+
     # Select the path inside structs. E.g. x['a']['b']['c'] given current_sub_path = [a, b, c].
-    path_key = inner_var + ''.join([f'[{escape_string_literal(p)}]' for p in current_sub_path])
-    if len(sub_paths) == 1:
-      if span_from:
-        duckdb_path = self._leaf_path_to_duckdb_path(span_from, schema)
-        derived_col = self._select_sql(
-          duckdb_path, flatten=False, unnest=False, path=path, schema=schema
-        )
-        path_key = (
-          f'{derived_col}[{path_key}.{SPAN_KEY}.{TEXT_SPAN_START_FEATURE}+1:'
-          f'{path_key}.{SPAN_KEY}.{TEXT_SPAN_END_FEATURE}]'
-        )
-      return 'NULL' if empty else path_key
-    return (
-      f'list_transform({path_key}, {lambda_var} -> '
-      f'{self._inner_select(sub_paths[1:], path, schema, lambda_var, empty, span_from)})'
-    )
+    path_key = inner_var + _struct_keys_sql(current_sub_path)
+    if span_from:
+      duckdb_path = self._leaf_path_to_duckdb_path(span_from, schema)
+      derived_col = self._select_sql(
+        duckdb_path, flatten=False, unnest=False, path=path, schema=schema
+      )
+      path_key = (
+        f'{derived_col}[{path_key}.{SPAN_KEY}.{TEXT_SPAN_START_FEATURE}+1:'
+        f'{path_key}.{SPAN_KEY}.{TEXT_SPAN_END_FEATURE}]'
+      )
+    leaf = 'NULL' if empty else path_key
+    return ''.join(prefixes) + leaf + ')' * len(prefixes)
 
   def _select_sql(
     self,
@@ -3569,7 +3630,7 @@ class DatasetDuckDB(Dataset):
         to a substring of the original string.
     """
     sub_paths = _split_path_into_subpaths_of_lists(sql_path)
-    selection = self._inner_select(sub_paths, path, schema, None, empty, span_from)
+    selection = self._inner_select(sub_paths, path, schema, empty, span_from)
     # We only flatten when the result is a deeply nested list to avoid segfault.
     # The nesting list level is a func of subpaths, e.g. subPaths = [[a, b, c], *, *] is 2 levels.
     nesting_level = len(sub_paths) - 1
@@ -3609,29 +3670,64 @@ class DatasetDuckDB(Dataset):
     return filters
 
 
+def _read_signal_manifest(filepath: str) -> SignalManifest:
+  """Read and parse a signal manifest file."""
+  with open_file(filepath) as f:
+    return SignalManifest.model_validate_json(f.read())
+
+
+def _read_map_manifest(filepath: str) -> MapManifest:
+  """Read and parse a map manifest file."""
+  with open_file(filepath) as f:
+    return MapManifest.model_validate_json(f.read())
+
+
+def _scan_files(dir_path: str) -> Iterator[os.DirEntry]:
+  """Recursively yield the non-hidden files under a directory.
+
+  Equivalent to filtering a recursive `glob('**')` with `os.path.isfile`, but the file type comes
+  from the directory listing, saving a stat call per file.
+  """
+  with os.scandir(dir_path) as entries:
+    for entry in entries:
+      if entry.name.startswith('.'):
+        continue
+      if entry.is_dir():
+        yield from _scan_files(entry.path)
+      elif entry.is_file():
+        yield entry
+
+
+def _struct_keys_sql(sub_path: PathTuple) -> str:
+  """Returns the struct key accessors for a path, e.g. ['a']['b'] for (a, b)."""
+  return ''.join([f'[{escape_string_literal(p)}]' for p in sub_path])
+
+
 def _escape_like_value(value: str) -> str:
   value = value.replace('%', '\\%').replace('_', '\\_')
   value = escape_string_literal(f'%{value}%')
   return f"{value} ESCAPE '\\'"
 
 
-def _split_path_into_subpaths_of_lists(leaf_path: PathTuple) -> list[PathTuple]:
+# Paths are split on every select SQL we build. The result is a tuple so cached values are
+# immutable, and the cache is bounded since paths can come from API requests.
+@functools.lru_cache(maxsize=1024)
+def _split_path_into_subpaths_of_lists(leaf_path: PathTuple) -> tuple[PathTuple, ...]:
   """Split a path into a subpath of lists.
 
   E.g. [a, b, c, *, d, *, *] gets splits [[a, b, c], [d], [], []].
   """
+  if PATH_WILDCARD not in leaf_path:
+    return (leaf_path,)
+
   sub_paths: list[PathTuple] = []
   offset = 0
-  while offset <= len(leaf_path):
-    new_offset = (
-      leaf_path.index(PATH_WILDCARD, offset)
-      if PATH_WILDCARD in leaf_path[offset:]
-      else len(leaf_path)
-    )
-    sub_path = leaf_path[offset:new_offset]
-    sub_paths.append(sub_path)
-    offset = new_offset + 1
-  return sub_paths
+  for i, path_part in enumerate(leaf_path):
+    if path_part == PATH_WILDCARD:
+      sub_paths.append(leaf_path[offset:i])
+      offset = i + 1
+  sub_paths.append(leaf_path[offset:])
+  return tuple(sub_paths)
 
 
 def read_source_manifest(dataset_path: str) -> SourceManifest:
@@ -3736,9 +3832,13 @@ def split_parquet_prefix(column_name: str, splitter_name: str) -> str:
   return f'{column_name}.{splitter_name}'
 
 
+# The `\xNN` escape for every byte value, used to build blob literals without a regex.
+_BLOB_BYTE_ESCAPES = [f'\\x{i:02x}' for i in range(256)]
+
+
 def _bytes_to_blob_literal(bytes: bytes) -> str:
   """Convert bytes to a blob literal."""
-  escaped_hex = re.sub(r'(.{2})', r'\\x\1', bytes.hex())
+  escaped_hex = ''.join(map(_BLOB_BYTE_ESCAPES.__getitem__, bytes))
   return f"'{escaped_hex}'::BLOB"
 
 
@@ -3874,9 +3974,14 @@ def _make_schema_from_path(path: PathTuple, field: Field) -> Schema:
 def _replace_nan_with_none(df: pd.DataFrame) -> pd.DataFrame:
   """DuckDB returns np.nan for missing field in string column, replace with None for correctness."""
   # TODO(https://github.com/duckdb/duckdb/issues/4066): Remove this once duckdb fixes upstream.
-  for col in df.columns:
-    if is_object_dtype(df[col]):
-      df[col] = df[col].replace(np.nan, None)
+  for col in df.select_dtypes(include='object').columns:
+    values = df[col].to_numpy()
+    missing = pd.isna(values)
+    # Most columns have no missing values, so skip rewriting them.
+    if missing.any():
+      values = values.copy()
+      values[missing] = None
+      df[col] = values
   return df
 
 
@@ -3948,6 +4053,46 @@ def _normalize_bins(bins: Optional[Union[Sequence[Bin], Sequence[float]]]) -> Op
   return named_bins
 
 
+def _bins_are_contiguous(bins: list[Bin]) -> bool:
+  """Returns true when every bin ends exactly where the next one starts."""
+  return all(prev_end == next_start for (_, _, prev_end), (_, next_start, _) in zip(bins, bins[1:]))
+
+
+def _bins_case_sql(value_sql: str, bins: list[Bin], filter_nans: bool) -> str:
+  """Returns a CASE expression that maps a numeric value to the label of the bin it falls in.
+
+  An open end is treated as `< +Infinity`, so +Infinity itself falls outside every bin. Values
+  outside every bin, NULLs and (when `filter_nans` is set) NaNs map to NULL.
+  """
+  when_clauses: list[str] = []
+  if filter_nans:
+    # DuckDB orders NaN above +Infinity, so exclude it explicitly.
+    when_clauses.append(f'WHEN isnan({value_sql}) THEN NULL')
+
+  if _bins_are_contiguous(bins):
+    # Contiguous bins (e.g. auto-bins or a list of edges) behave like `np.digitize`: CASE branches
+    # are evaluated in order, so each branch only needs to compare against the upper edge.
+    first_start = bins[0][1]
+    if first_start is not None:
+      when_clauses.append(f'WHEN {value_sql} < {first_start} THEN NULL')
+    for label, _, end in bins:
+      when_clauses.append(
+        f'WHEN {value_sql} < {_bin_end_sql(end)} THEN {escape_string_literal(label)}'
+      )
+  else:
+    for label, start, end in bins:
+      condition = f'{value_sql} < {_bin_end_sql(end)}'
+      if start is not None:
+        condition = f'{value_sql} >= {start} AND {condition}'
+      when_clauses.append(f'WHEN {condition} THEN {escape_string_literal(label)}')
+  return f'(CASE {" ".join(when_clauses)} ELSE NULL END)'
+
+
+def _bin_end_sql(end: Optional[float]) -> str:
+  """Returns the SQL for the exclusive upper edge of a bin, where an open end is +Infinity."""
+  return str(end) if end is not None else "'Infinity'::DOUBLE"
+
+
 def _auto_bins(stats: StatsResult) -> list[Bin]:
   if stats.min_val is None or stats.max_val is None:
     return [('0', None, None)]
@@ -0,0 +1,49 @@
+"""Tests for dataset.pivot()."""
+
+from ..schema import Item
+from .dataset import GroupsSortBy, PivotResult, PivotResultOuterGroup, SortOrder
+from .dataset_test_utils import TestDataMaker
+
+ITEMS: list[Item] = [
+  {'country': 'US', 'lang': 'en'},
+  {'country': 'US', 'lang': 'en'},
+  {'country': 'US', 'lang': 'es'},
+  {'country': 'MX', 'lang': 'es'},
+  {'country': 'FR'},  # Missing "lang".
+]
+
+
+def test_pivot(make_test_data: TestDataMaker) -> None:
+  dataset = make_test_data(ITEMS)
+
+  result = dataset.pivot(outer_path='country', inner_path='lang')
+  assert result == PivotResult(
+    outer_groups=[
+      PivotResultOuterGroup(value='US', count=3, inner=[('en', 2), ('es', 1)]),
+      PivotResultOuterGroup(value='FR', count=1, inner=[(None, 1)]),
+      PivotResultOuterGroup(value='MX', count=1, inner=[('es', 1)]),
+    ]
+  )
+
+
+def test_pivot_sort_by_value(make_test_data: TestDataMaker) -> None:
+  dataset = make_test_data(ITEMS)
+
+  result = dataset.pivot(
+    outer_path='country', inner_path='lang', sort_by=GroupsSortBy.VALUE, sort_order=SortOrder.ASC
+  )
+  assert [group.value for group in result.outer_groups] == ['FR', 'MX', 'US']
+
+
+def test_pivot_filters(make_test_data: TestDataMaker) -> None:
+  dataset = make_test_data(ITEMS)
+
+  result = dataset.pivot(
+    outer_path='country', inner_path='lang', filters=[('lang', 'equals', 'es')]
+  )
+  assert result == PivotResult(
+    outer_groups=[
+      PivotResultOuterGroup(value='MX', count=1, inner=[('es', 1)]),
+      PivotResultOuterGroup(value='US', count=1, inner=[('es', 1)]),
+    ]
+  )
@@ -1,14 +1,19 @@
 """Tests for dataset.select_groups()."""
 
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from typing import Any, cast
 
 import pytest
 from pytest_mock import MockerFixture
 
 from ..schema import Field, Item, MapType, field, schema
 from . import dataset as dataset_module
+from . import dataset_duckdb as dataset_duckdb_module
 from .dataset import GroupsSortBy, SelectGroupsResult, SortOrder
+from .dataset_duckdb import DatasetDuckDB
 from .dataset_test_utils import TestDataMaker
 
 
@@ -141,6 +146,50 @@ def test_named_bins(make_test_data: TestDataMaker) -> None:
   assert result.counts == [('adult', 2), ('middle-aged', 1), ('senior', 1), ('young', 1), (None, 1)]
 
 
+def test_named_bins_with_quotes(make_test_data: TestDataMaker) -> None:
+  items: list[Item] = [{'age': 34.0}, {'age': 17.0}, {'age': 15.0}]
+  dataset = make_test_data(items)
+
+  result = dataset.select_groups(leaf_path='age', bins=[("kid's", None, 20), ("adult's", 20, None)])
+  assert result.counts == [("kid's", 2), ("adult's", 1)]
+
+
+def test_named_bins_with_gap(make_test_data: TestDataMaker) -> None:
+  items: list[Item] = [{'age': 5.0}, {'age': 15.0}, {'age': 25.0}, {'age': 30.0}]
+  dataset = make_test_data(items)
+
+  result = dataset.select_groups(leaf_path='age', bins=[('low', None, 10), ('high', 20, None)])
+  assert result.counts == [('high', 2), ('low', 1), (None, 1)]
+
+
+def test_bins_with_infinity(make_test_data: TestDataMaker) -> None:
+  items: list[Item] = [
+    {'age': 5.0},
+    {'age': float('inf')},
+    {'age': 30.0},
+    {'age': float('-inf')},
+  ]
+  dataset = make_test_data(items)
+
+  # Open-ended bins stop below +Infinity, so +Infinity falls outside every bin.
+  result = dataset.select_groups(leaf_path='age', bins=[10, 20])
+  assert result.counts == [('0', 2), ('2', 1), (None, 1)]
+
+  result = dataset.select_groups(leaf_path='age', bins=[('low', None, 10), ('high', 20, None)])
+  assert result.counts == [('low', 2), ('high', 1), (None, 1)]
+
+
+def test_named_bins_as_lists(make_test_data: TestDataMaker) -> None:
+  items: list[Item] = [{'age': 5.0}, {'age': 7.0}, {'age': 25.0}, {}]
+  dataset = make_test_data(items)
+
+  bins = [['low', None, 10], ['high', 10, None]]
+  result = dataset.select_groups(leaf_path='age', bins=bins)  # type: ignore
+  assert result.counts == [('low', 2), ('high', 1), (None, 1)]
+  # The cached result is returned for the same list bins.
+  assert dataset.select_groups(leaf_path='age', bins=bins) == result  # type: ignore
+
+
 def test_schema_with_bins(make_test_data: TestDataMaker) -> None:
   items: list[Item] = [
     {'age': 34},
@@ -253,6 +302,93 @@ def test_too_many_distinct(make_test_data: TestDataMaker, mocker: MockerFixture)
   assert res.counts == []
 
 
+def test_few_rows_skips_stats(make_test_data: TestDataMaker, mocker: MockerFixture) -> None:
+  items: list[Item] = [{'feature': 'a'}, {'feature': 'b'}, {'feature': 'a'}]
+  dataset = make_test_data(items)
+  stats_spy = mocker.spy(dataset, 'stats')
+
+  res = dataset.select_groups('feature')
+  assert res.counts == [('a', 2), ('b', 1)]
+  # Fewer rows than `TOO_MANY_DISTINCT` means stats are not needed for a non-repeated leaf.
+  stats_spy.assert_not_called()
+
+
+def test_results_are_cached(make_test_data: TestDataMaker, mocker: MockerFixture) -> None:
+  items: list[Item] = [{'name': 'a', 'age': 1}, {'name': 'b', 'age': 2}, {'name': 'a', 'age': 3}]
+  dataset = make_test_data(items)
+  first = dataset.select_groups('name')
+  query_spy = mocker.spy(dataset, '_query')
+
+  assert dataset.select_groups('name') == first
+  query_spy.assert_not_called()
+
+  # Different arguments and filtered queries are computed.
+  assert dataset.select_groups('name', sort_by=GroupsSortBy.VALUE).counts == [('b', 1), ('a', 2)]
+  assert dataset.select_groups('name', filters=[('age', 'less', 2)]).counts == [('a', 1)]
+  assert query_spy.call_count == 2
+
+
+def test_cache_evicts_least_recently_used(
+  make_test_data: TestDataMaker, mocker: MockerFixture
+) -> None:
+  mocker.patch(f'{dataset_duckdb_module.__name__}.SELECT_GROUPS_CACHE_SIZE', 2)
+  items: list[Item] = [{'name': 'a', 'age': 1}, {'name': 'b', 'age': 2}, {'name': 'a', 'age': 3}]
+  dataset = make_test_data(items)
+  dataset.select_groups('name')
+  dataset.select_groups('age')
+  # Touch 'name' so 'age' becomes the least recently used entry.
+  dataset.select_groups('name')
+  dataset.select_groups('name', sort_by=GroupsSortBy.VALUE)
+  query_spy = mocker.spy(dataset, '_query')
+
+  dataset.select_groups('name')
+  query_spy.assert_not_called()
+  dataset.select_groups('age')
+  assert query_spy.call_count == 1
+
+
+def test_cache_clear_from_another_thread_during_a_hit(make_test_data: TestDataMaker) -> None:
+  items: list[Item] = [{'name': 'a'}, {'name': 'b'}, {'name': 'a'}]
+  dataset = cast(DatasetDuckDB, make_test_data(items))
+  expected = dataset.select_groups('name')
+  clearers: list[threading.Thread] = []
+
+  class ClearingCache(OrderedDict):
+    def get(self, key: Any, default: Any = None) -> Any:
+      value = super().get(key, default)
+      # Invalidate from another thread between the lookup and the LRU bump. The clear has to wait
+      # for the cache lock, so the hit still returns the cached value.
+      clearer = threading.Thread(target=dataset._clear_select_groups_cache)
+      clearer.start()
+      clearer.join(timeout=0.1)
+      clearers.append(clearer)
+      return value
+
+  dataset._select_groups_cache = ClearingCache(dataset._select_groups_cache)
+  assert dataset.select_groups('name') == expected
+  for clearer in clearers:
+    clearer.join()
+  assert len(dataset._select_groups_cache) == 0
+
+
+def test_cache_skips_results_computed_before_a_clear(
+  make_test_data: TestDataMaker, mocker: MockerFixture
+) -> None:
+  items: list[Item] = [{'name': 'a'}, {'name': 'b'}, {'name': 'a'}]
+  dataset = cast(DatasetDuckDB, make_test_data(items))
+  query = dataset._query
+
+  def query_then_clear(sql: str) -> list[tuple]:
+    result = query(sql)
+    # Simulate a label edit invalidating the cache while the groups are being computed.
+    dataset._clear_select_groups_cache()
+    return result
+
+  mocker.patch.object(dataset, '_query', side_effect=query_then_clear)
+  dataset.select_groups('name')
+  assert dataset._select_groups_cache == {}
+
+
 def test_auto_bins_for_float(make_test_data: TestDataMaker) -> None:
   items: list[Item] = [{'feature': float(i)} for i in range(5)] + [{'feature': float('nan')}]
   dataset = make_test_data(items)
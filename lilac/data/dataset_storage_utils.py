@@ -11,6 +11,7 @@ from ..env import env, get_project_dir
 from ..project import add_project_dataset_config, read_project_config
 from ..sources.huggingface_source import HuggingFaceSource
 from ..utils import (
+  copy_tree,
   get_dataset_output_dir,
   get_datasets_dir,
   get_lilac_cache_dir,
@@ -96,7 +97,7 @@ def download(
   dataset_dir = os.path.join(datasets_dir, dataset_namespace, dataset_name)
   os.makedirs(dataset_dir, exist_ok=True)
 
-  shutil.copytree(src, dataset_dir, dirs_exist_ok=True)
+  copy_tree(src, dataset_dir)
 
   ds = get_dataset(dataset_namespace, dataset_name)
   dataset_config_filename = os.path.join(dataset_dir, 'dataset_config.yml')
@@ -9,7 +9,7 @@ import pprint
 import secrets
 from collections.abc import Iterable
 from functools import partial
-from typing import Any, Callable, Generator, Iterator, Optional, TypeVar, Union, cast
+from typing import Any, Callable, Generator, Iterator, Optional, Sequence, TypeVar, Union, cast
 
 import numpy as np
 import pyarrow as pa
@@ -81,7 +81,7 @@ def _wrap_value_in_dict(input: Union[object, dict], props: PathTuple) -> Union[o
 
 
 def _wrap_in_dicts(
-  input: Union[object, Iterable[object]], spec: list[PathTuple]
+  input: Union[object, Iterable[object]], spec: Sequence[PathTuple]
 ) -> Union[object, Iterable[object]]:
   """Wraps an object or iterable in a dict according to the spec."""
   props = spec[0] if spec else tuple()
@@ -99,7 +99,7 @@ def _wrap_in_dicts(
   return _wrap_value_in_dict(res, props)
 
 
-def wrap_in_dicts(input: Iterable[object], spec: list[PathTuple]) -> Generator:
+def wrap_in_dicts(input: Iterable[object], spec: Sequence[PathTuple]) -> Generator:
   """Wraps an object or iterable in a dict according to the spec."""
   return (_wrap_in_dicts(elem, spec) for elem in input)
 
@@ -293,19 +293,25 @@ def get_parquet_filename(prefix: str, shard_index: int, num_shards: int) -> str:
 def _flatten_keys(
   rowid: str,
   nested_input: Iterable[Any],
-  location: list[int],
   is_primitive_predicate: Callable[[object], bool],
 ) -> Iterator[VectorKey]:
-  if (
-    is_primitive_predicate(nested_input)
-    or is_primitive(nested_input)
-    or isinstance(nested_input, dict)
-  ):
-    yield (rowid, *location)
-    return
-
-  for i, input in enumerate(nested_input):
-    yield from _flatten_keys(rowid, input, [*location, i], is_primitive_predicate)
+  # Walk the nested input depth-first with an explicit stack of iterators. `location` holds the
+  # index at every level and is updated in place instead of being copied per level.
+  stack = [enumerate(nested_input)]
+  location = [0]
+  while stack:
+    next_input = next(stack[-1], None)
+    if next_input is None:
+      stack.pop()
+      location.pop()
+      continue
+    i, input = next_input
+    location[-1] = i
+    if is_primitive_predicate(input) or is_primitive(input) or isinstance(input, dict):
+      yield (rowid, *location)
+    else:
+      stack.append(enumerate(input))
+      location.append(0)
 
 
 def flatten_keys(
@@ -318,7 +324,11 @@ def flatten_keys(
     if input is None:
       yield None
       continue
-    yield from _flatten_keys(rowid, input, [], is_primitive_predicate)
+    if is_primitive_predicate(input) or is_primitive(input) or isinstance(input, dict):
+      # Non-repeated inputs have a single key, so skip the recursive generator.
+      yield (rowid,)
+      continue
+    yield from _flatten_keys(rowid, input, is_primitive_predicate)
 
 
 Tin = TypeVar('Tin')
@@ -4,7 +4,7 @@ from typing import Iterable, Iterator
 
 from ..schema import PathTuple
 from ..utils import chunks
-from .dataset_utils import count_leafs, sparse_to_dense_compute, wrap_in_dicts
+from .dataset_utils import count_leafs, flatten_keys, sparse_to_dense_compute, wrap_in_dicts
 
 
 def test_count_nested() -> None:
@@ -12,6 +12,21 @@ def test_count_nested() -> None:
   assert 6 == count_leafs(a)
 
 
+def test_flatten_keys() -> None:
+  rowids = ['a', 'b', 'c', 'd', 'e']
+  nested_input = ['hello', None, [['x', 'y'], ['z']], {'text': 'hi'}, [[['u'], []], ['v']]]
+  assert list(flatten_keys(rowids, nested_input)) == [
+    ('a',),
+    None,
+    ('c', 0, 0),
+    ('c', 0, 1),
+    ('c', 1, 0),
+    ('d',),
+    ('e', 0, 0, 0),
+    ('e', 1, 0),
+  ]
+
+
 def test_wrap_in_dicts_with_spec_of_one_repeated() -> None:
   a = [[1, 2], [3], [4, 5, 5]]
   spec: list[PathTuple] = [('a', 'b', 'c'), ('d',)]  # Corresponds to a.b.c.*.d.
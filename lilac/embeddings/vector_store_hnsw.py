@@ -41,6 +41,8 @@ class HNSWVectorStore(VectorStore):
   def delete(self, base_path: str) -> None:
     os.remove(base_path + _HNSW_SUFFIX)
     os.remove(base_path + _LOOKUP_SUFFIX)
+    self._key_to_label = None
+    self._index = None
 
   @override
   def save(self, base_path: str) -> None:
@@ -23,11 +23,18 @@ class NumpyVectorStore(VectorStore):
     self._embeddings: Optional[np.ndarray] = None
     # Maps a `VectorKey` to a row index in `_embeddings`.
     self._key_to_index: Optional[pd.Series] = None
+    # The file `_embeddings` is memory-mapped from, while it is unchanged since `load()`.
+    self._mmap_filepath: Optional[str] = None
 
   @override
   def delete(self, base_path: str) -> None:
     os.remove(base_path + _EMBEDDINGS_SUFFIX)
     os.remove(base_path + _LOOKUP_SUFFIX)
+    # The memory-mapped embeddings may come from the removed file, so drop them along with the
+    # lookup that indexes into them.
+    self._embeddings = None
+    self._key_to_index = None
+    self._mmap_filepath = None
 
   @override
   def size(self) -> int:
@@ -41,12 +48,22 @@ class NumpyVectorStore(VectorStore):
     assert (
       self._embeddings is not None and self._key_to_index is not None
     ), 'The vector store has no embeddings. Call load() or add() first.'
-    np.save(base_path + _EMBEDDINGS_SUFFIX, self._embeddings, allow_pickle=False)
+    embeddings_filepath = os.path.abspath(base_path + _EMBEDDINGS_SUFFIX)
+    if embeddings_filepath != self._mmap_filepath:
+      # Write to a temporary file and swap it in, so existing memory maps of the previous file stay
+      # valid.
+      tmp_filepath = base_path + '.tmp' + _EMBEDDINGS_SUFFIX
+      np.save(tmp_filepath, self._embeddings, allow_pickle=False)
+      os.replace(tmp_filepath, embeddings_filepath)
     self._key_to_index.to_pickle(base_path + _LOOKUP_SUFFIX)
 
   @override
   def load(self, base_path: str) -> None:
-    self._embeddings = np.load(base_path + _EMBEDDINGS_SUFFIX, allow_pickle=False)
+    # Memory-map the embeddings so loading is near-instant and the pages are shared through the OS
+    # page cache across processes, instead of reading the whole matrix into memory.
+    embeddings_filepath = os.path.abspath(base_path + _EMBEDDINGS_SUFFIX)
+    self._embeddings = np.asarray(np.load(embeddings_filepath, mmap_mode='r', allow_pickle=False))
+    self._mmap_filepath = embeddings_filepath
     self._key_to_index = pd.read_pickle(base_path + _LOOKUP_SUFFIX)
 
   @override
@@ -57,6 +74,7 @@ class NumpyVectorStore(VectorStore):
       )
 
     current_size = self.size() if self._embeddings is not None else 0
+    self._mmap_filepath = None
 
     # Cast to float32 since dot product with float32 is 40-50x faster than float16 and 2.5x faster
     # than float64.
@@ -67,6 +67,39 @@ class VectorStoreImplSuite:
     np.testing.assert_array_equal(vectors[1], [3, 4])
     np.testing.assert_array_equal(vectors[2], [5, 6])
 
+  def test_add_after_load(self, store_cls: Type[VectorStore], tmp_path: pathlib.Path) -> None:
+    store = store_cls()
+    store.add([('a',), ('b',)], np.array([[1, 2], [3, 4]]))
+    store.save(str(tmp_path))
+
+    store = store_cls()
+    store.load(str(tmp_path))
+    # Saving a store that was just loaded must keep its files readable.
+    store.save(str(tmp_path))
+    store.add([('c',)], np.array([[5, 6]]))
+    store.save(str(tmp_path))
+
+    store = store_cls()
+    store.load(str(tmp_path))
+    vectors = list(store.get([('a',), ('b',), ('c',)]))
+    assert len(vectors) == 3
+    np.testing.assert_array_equal(vectors[0], [1, 2])
+    np.testing.assert_array_equal(vectors[1], [3, 4])
+    np.testing.assert_array_equal(vectors[2], [5, 6])
+
+    # Deleting a loaded store clears it, so a later save can't skip writing the embeddings.
+    store.delete(str(tmp_path))
+    with pytest.raises(AssertionError):
+      store.save(str(tmp_path))
+    store.add([('d',)], np.array([[7, 8]]))
+    store.save(str(tmp_path))
+
+    store = store_cls()
+    store.load(str(tmp_path))
+    vectors = list(store.get([('d',)]))
+    assert len(vectors) == 1
+    np.testing.assert_array_equal(vectors[0], [7, 8])
+
   def test_topk(self, store_cls: Type[VectorStore]) -> None:
     store = store_cls()
     embedding = cast(np.ndarray, normalize(np.array([[1, 0], [0, 1], [1, 1]])))
@@ -2,6 +2,7 @@
 
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from typing import TypedDict
 
 import yaml
@@ -9,7 +10,10 @@ import yaml
 from .concepts.db_concept import DiskConceptDB, get_concept_output_dir
 from .env import env, get_project_dir
 from .project import PROJECT_CONFIG_FILENAME
-from .utils import DebugTimer, get_datasets_dir, get_lilac_cache_dir, log
+from .utils import DebugTimer, copy_tree, get_datasets_dir, get_lilac_cache_dir, log
+
+# The maximum number of concept directories to copy in parallel on startup.
+COPY_MAX_WORKERS = 8
 
 
 def delete_old_files() -> None:
@@ -119,11 +123,11 @@ def _hf_docker_start() -> None:
   # Copy cache files from the space if they exist.
   spaces_cache_dir = get_lilac_cache_dir(spaces_data_dir)
   if os.path.exists(spaces_cache_dir):
-    shutil.copytree(spaces_cache_dir, cache_dir)
+    copy_tree(spaces_cache_dir, cache_dir)
 
-  # Copy concepts.
-  concepts = DiskConceptDB(spaces_data_dir).list()
-  for concept in concepts:
+  # Copy concepts. The output directories are disjoint, so the copies run in parallel.
+  concept_dirs: list[tuple[str, str]] = []
+  for concept in DiskConceptDB(spaces_data_dir).list():
     # Ignore lilac concepts, they're already part of the source code.
     if concept.namespace == 'lilac':
       continue
@@ -133,6 +137,14 @@ def _hf_docker_start() -> None:
     persistent_output_dir = get_concept_output_dir(
       get_project_dir(), concept.namespace, concept.name
     )
-    shutil.rmtree(persistent_output_dir, ignore_errors=True)
-    shutil.copytree(spaces_concept_output_dir, persistent_output_dir, dirs_exist_ok=True)
-    shutil.rmtree(spaces_concept_output_dir, ignore_errors=True)
+    concept_dirs.append((spaces_concept_output_dir, persistent_output_dir))
+
+  with ThreadPoolExecutor(max_workers=COPY_MAX_WORKERS) as executor:
+    # Consume the iterator so exceptions from the workers are raised.
+    list(executor.map(lambda dirs: _move_concept(*dirs), concept_dirs))
+
+
+def _move_concept(spaces_concept_output_dir: str, persistent_output_dir: str) -> None:
+  shutil.rmtree(persistent_output_dir, ignore_errors=True)
+  copy_tree(spaces_concept_output_dir, persistent_output_dir)
+  shutil.rmtree(spaces_concept_output_dir, ignore_errors=True)
@@ -18,9 +18,11 @@ class ParquetWriter:
     record_batch_size: int = 10_000,
   ):
     self._schema = schema_to_arrow_schema(schema)
+    # `pa.Schema.names` builds a new list on every access, so resolve it once for `write()`.
+    self._names = self._schema.names
     self._codec = codec
     self._row_group_buffer_size = row_group_buffer_size
-    self._buffer: list[list[Optional[Item]]] = [[] for _ in range(len(self._schema.names))]
+    self._buffer: list[list[Optional[Item]]] = [[] for _ in range(len(self._names))]
     self._buffer_size = record_batch_size
     self._record_batches: list[pa.RecordBatch] = []
     self._record_batches_byte_size = 0
@@ -39,8 +41,8 @@ class ParquetWriter:
       self._write_batches()
 
     # reorder the data in columnar format.
-    for i, n in enumerate(self._schema.names):
-      self._buffer[i].append(record.get(n))
+    for column, name in zip(self._buffer, self._names):
+      column.append(record.get(name))
 
   def close(self) -> None:
     """Flushes the write buffer and closes the destination file."""
@@ -58,7 +60,7 @@ class ParquetWriter:
     self.writer.write_table(table)
 
   def _flush_buffer(self) -> None:
-    arrays: list[pa.array] = [[] for _ in range(len(self._schema.names))]
+    arrays: list[pa.array] = [[] for _ in range(len(self._names))]
     for x, y in enumerate(self._buffer):
       arrays[x] = pa.array(y, type=self._schema.types[x])
       self._buffer[x] = []
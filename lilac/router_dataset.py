@@ -3,7 +3,9 @@ import os
 from copy import copy
 from typing import Annotated, Any, Literal, Optional, Sequence, Union, cast
 
-from fastapi import APIRouter, HTTPException, Response
+import orjson
+import pyarrow as pa
+from fastapi import APIRouter, Header, HTTPException, Response
 from fastapi.params import Depends
 from fastapi.responses import FileResponse, ORJSONResponse
 from pydantic import BaseModel, Field
@@ -242,16 +244,55 @@ class SelectGroupsOptions(BaseModel):
   bins: Optional[list[Bin]] = None
 
 
+# Clients can request select_groups as an Arrow IPC stream, which is much smaller and cheaper to
+# encode than JSON when there are many groups.
+ARROW_STREAM_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+
+
+def _orjson_response(model: BaseModel) -> ORJSONResponse:
+  """Serialize a model directly with orjson, skipping re-validation against the response model."""
+  return ORJSONResponse(model.model_dump())
+
+
+def _accepts_arrow_stream(accept: Optional[str]) -> bool:
+  """Whether the `Accept` header lists the Arrow stream media type, ignoring any parameters."""
+  if not accept:
+    return False
+  media_types = {media_range.split(';')[0].strip().lower() for media_range in accept.split(',')}
+  return ARROW_STREAM_MEDIA_TYPE in media_types
+
+
+def _groups_to_arrow_stream(res: SelectGroupsResult) -> bytes:
+  """Encode the groups as a `value`, `count` table with the rest of the result as metadata."""
+  values = [value for value, _ in res.counts]
+  counts = [count for _, count in res.counts]
+  metadata = {'too_many_distinct': orjson.dumps(res.too_many_distinct)}
+  if res.bins is not None:
+    metadata['bins'] = orjson.dumps(res.bins)
+  table = pa.table({'value': values, 'count': pa.array(counts, pa.int64())}, metadata=metadata)
+  sink = pa.BufferOutputStream()
+  with pa.ipc.new_stream(sink, table.schema) as writer:
+    writer.write_table(table)
+  return sink.getvalue().to_pybytes()
+
+
 @router.post('/{namespace}/{dataset_name}/select_groups')
 def select_groups(
-  namespace: str, dataset_name: str, options: SelectGroupsOptions
+  namespace: str,
+  dataset_name: str,
+  options: SelectGroupsOptions,
+  accept: Annotated[Optional[str], Header()] = None,
 ) -> SelectGroupsResult:
-  """Select groups from the dataset database."""
+  """Select groups from the dataset database.
+
+  Returns JSON by default, or an Arrow IPC stream when the `Accept` header includes
+  `application/vnd.apache.arrow.stream`.
+  """
   dataset = get_dataset(namespace, dataset_name)
   sanitized_filters = [
     PyFilter(path=normalize_path(f.path), op=f.op, value=f.value) for f in (options.filters or [])
   ]
-  return dataset.select_groups(
+  res = dataset.select_groups(
     options.leaf_path,
     sanitized_filters,
     options.sort_by,
@@ -260,6 +301,10 @@ def select_groups(
     options.bins,
     searches=options.searches,
   )
+  if _accepts_arrow_stream(accept):
+    arrow_response = Response(_groups_to_arrow_stream(res), media_type=ARROW_STREAM_MEDIA_TYPE)
+    return cast(SelectGroupsResult, arrow_response)
+  return cast(SelectGroupsResult, _orjson_response(res))
 
 
 class PivotOptions(BaseModel):
@@ -278,12 +323,13 @@ def pivot(namespace: str, dataset_name: str, options: PivotOptions) -> PivotResu
   sanitized_filters = [
     PyFilter(path=normalize_path(f.path), op=f.op, value=f.value) for f in (options.filters or [])
   ]
-  return dataset.pivot(
+  res = dataset.pivot(
     options.outer_path,
     options.inner_path,
     filters=sanitized_filters,
     searches=options.searches,
   )
+  return cast(PivotResult, _orjson_response(res))
 
 
 @router.get('/{namespace}/{dataset_name}/media')
@@ -224,11 +224,26 @@ async def favicon() -> FileResponse:
   return FileResponse(os.path.join(DIST_PATH, 'favicon.ico'))
 
 
+# Maps an HTML filepath to its (mtime, contents) so SPA navigations don't re-read the file.
+_HTML_CACHE: dict[str, tuple[float, bytes]] = {}
+
+
 @app.api_route('/{path_name:path}', include_in_schema=False)
-def catch_all(path_name: str) -> FileResponse:
+def catch_all(path_name: str) -> Response:
   """Catch any other requests and serve index for HTML5 history."""
   filename = f'{path_name or "index"}.html'
-  return FileResponse(path=os.path.join(DIST_PATH, filename))
+  filepath = os.path.join(DIST_PATH, filename)
+  try:
+    mtime = os.stat(filepath).st_mtime
+  except OSError:
+    return FileResponse(path=filepath)
+
+  cached = _HTML_CACHE.get(filepath)
+  if cached is None or cached[0] != mtime:
+    with open(filepath, 'rb') as f:
+      cached = (mtime, f.read())
+    _HTML_CACHE[filepath] = cached
+  return Response(content=cached[1], media_type='text/html')
 
 
 class GetTasksFilter(logging.Filter):
@@ -259,7 +274,9 @@ class Server(uvicorn.Server):
         self.run()
 
     if block:
-      run()
+      # No event loop is running, so let uvicorn install its configured loop (uvloop when
+      # available) instead of creating a default asyncio loop.
+      self.run()
     else:
       self.thread = Thread(target=run, daemon=True)
       self.thread.start()
@@ -2,13 +2,20 @@
 import os
 from typing import ClassVar, Iterable, Iterator, Optional, Type
 
+import pyarrow as pa
 import pytest
 from fastapi.testclient import TestClient
 from pytest_mock import MockerFixture
 
 from .auth import UserInfo, get_session_user
 from .config import DatasetSettings
-from .data.dataset import Dataset, DatasetManifest, SelectRowsSchemaResult, SelectRowsSchemaUDF
+from .data.dataset import (
+  Dataset,
+  DatasetManifest,
+  SelectGroupsResult,
+  SelectRowsSchemaResult,
+  SelectRowsSchemaUDF,
+)
 from .data.dataset_duckdb import DatasetDuckDB
 from .data.dataset_test_utils import (
   TEST_DATASET_NAME,
@@ -18,8 +25,10 @@ from .data.dataset_test_utils import (
   make_dataset,
 )
 from .router_dataset import (
+  ARROW_STREAM_MEDIA_TYPE,
   AddLabelsOptions,
   Column,
+  SelectGroupsOptions,
   SelectRowsOptions,
   SelectRowsResponse,
   SelectRowsSchemaOptions,
@@ -286,6 +295,44 @@ def test_select_rows_schema_no_cols() -> None:
   )
 
 
+def test_select_groups() -> None:
+  url = f'/api/v1/datasets/{TEST_NAMESPACE}/{TEST_DATASET_NAME}/select_groups'
+  options = SelectGroupsOptions(leaf_path=('people', '*', 'zipcode'), bins=[('low', None, 1)])
+  response = client.post(url, json=options.model_dump())
+  assert response.status_code == 200
+  assert SelectGroupsResult.model_validate(response.json()) == SelectGroupsResult(
+    too_many_distinct=False, counts=[(None, 2), ('low', 1)], bins=[('low', None, 1)]
+  )
+
+
+def test_select_groups_arrow_stream() -> None:
+  url = f'/api/v1/datasets/{TEST_NAMESPACE}/{TEST_DATASET_NAME}/select_groups'
+  options = SelectGroupsOptions(leaf_path='erased')
+  response = client.post(
+    url, json=options.model_dump(), headers={'Accept': ARROW_STREAM_MEDIA_TYPE}
+  )
+  assert response.status_code == 200
+  assert response.headers['content-type'] == ARROW_STREAM_MEDIA_TYPE
+  table = pa.ipc.open_stream(response.content).read_all()
+  assert table.to_pylist() == [{'value': True, 'count': 2}, {'value': False, 'count': 1}]
+  assert table.schema.metadata == {b'too_many_distinct': b'false'}
+
+
+def test_select_groups_arrow_stream_in_accept_list() -> None:
+  url = f'/api/v1/datasets/{TEST_NAMESPACE}/{TEST_DATASET_NAME}/select_groups'
+  options = SelectGroupsOptions(leaf_path='erased')
+  accept = f'application/json;q=0.5, {ARROW_STREAM_MEDIA_TYPE};q=0.9, */*;q=0.1'
+  response = client.post(url, json=options.model_dump(), headers={'Accept': accept})
+  assert response.status_code == 200
+  assert response.headers['content-type'] == ARROW_STREAM_MEDIA_TYPE
+  table = pa.ipc.open_stream(response.content).read_all()
+  assert table.to_pylist() == [{'value': True, 'count': 2}, {'value': False, 'count': 1}]
+
+  # Without the Arrow media type the result is JSON.
+  response = client.post(url, json=options.model_dump(), headers={'Accept': '*/*'})
+  assert response.headers['content-type'] == 'application/json'
+
+
 def test_update_settings_auth(mocker: MockerFixture) -> None:
   mocker.patch.dict(os.environ, {'LILAC_AUTH_ENABLED': 'True'})
 
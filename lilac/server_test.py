@@ -1,5 +1,6 @@
 """Test our public REST API."""
 import os
+import pathlib
 
 from fastapi.testclient import TestClient
 from pytest_mock import MockerFixture
@@ -185,3 +186,19 @@ def test_slash_redirect() -> None:
   # Allow redirects to follow through.
   response = client.get('/auth_info/', allow_redirects=True)
   assert response.status_code == 200
+
+
+def test_catch_all_serves_html(tmp_path: pathlib.Path, mocker: MockerFixture) -> None:
+  mocker.patch('lilac.server.DIST_PATH', str(tmp_path))
+  index_path = tmp_path / 'index.html'
+  index_path.write_text('<html>v1</html>')
+
+  response = client.get('/')
+  assert response.status_code == 200
+  assert response.headers['content-type'].startswith('text/html')
+  assert response.text == '<html>v1</html>'
+
+  # A rebuilt file is picked up on the next request.
+  index_path.write_text('<html>v2</html>')
+  os.utime(index_path, (0, 0))
+  assert client.get('/').text == '<html>v2</html>'
@@ -0,0 +1,80 @@
+"""Tests for utils.py."""
+
+import os
+import pathlib
+import shutil
+import sys
+
+import pytest
+from pytest_mock import MockerFixture
+
+from . import utils
+from .utils import clone_file, copy_tree
+
+requires_fcntl = pytest.mark.skipif(
+  not sys.platform.startswith('linux'), reason='Reflinks are only attempted on Linux.'
+)
+
+
+def _write(path: pathlib.Path, data: bytes, mtime: float) -> None:
+  path.parent.mkdir(parents=True, exist_ok=True)
+  path.write_bytes(data)
+  os.utime(path, (mtime, mtime))
+
+
+def test_clone_file(tmp_path: pathlib.Path) -> None:
+  src = tmp_path / 'src.bin'
+  dst = tmp_path / 'dst.bin'
+  _write(src, b'hello world', mtime=1_000_000)
+
+  assert clone_file(str(src), str(dst)) == str(dst)
+
+  assert dst.read_bytes() == b'hello world'
+  assert dst.stat().st_mtime == src.stat().st_mtime
+
+
+@requires_fcntl
+def test_clone_file_falls_back_when_reflink_fails(
+  tmp_path: pathlib.Path, mocker: MockerFixture
+) -> None:
+  src = tmp_path / 'src.bin'
+  dst = tmp_path / 'dst.bin'
+  _write(src, b'hello world', mtime=1_000_000)
+  mocker.patch.object(utils.fcntl, 'ioctl', side_effect=OSError('reflinks not supported'))
+
+  assert clone_file(str(src), str(dst)) == str(dst)
+
+  assert dst.read_bytes() == b'hello world'
+  assert dst.stat().st_mtime == src.stat().st_mtime
+
+
+@requires_fcntl
+def test_clone_file_leaves_no_partial_file_when_fallback_fails(
+  tmp_path: pathlib.Path, mocker: MockerFixture
+) -> None:
+  src = tmp_path / 'src.bin'
+  dst = tmp_path / 'dst.bin'
+  _write(src, b'hello world', mtime=1_000_000)
+  mocker.patch.object(utils.fcntl, 'ioctl', side_effect=OSError('reflinks not supported'))
+  mocker.patch.object(shutil, 'copy2', side_effect=OSError('disk full'))
+
+  with pytest.raises(OSError, match='disk full'):
+    clone_file(str(src), str(dst))
+
+  assert not dst.exists()
+
+
+def test_copy_tree(tmp_path: pathlib.Path) -> None:
+  src = tmp_path / 'src'
+  dst = tmp_path / 'dst'
+  _write(src / 'a.txt', b'a', mtime=1_000_000)
+  _write(src / 'nested' / 'b.txt', b'b', mtime=2_000_000)
+  _write(src / 'nested' / 'deeper' / 'c.txt', b'c', mtime=3_000_000)
+
+  copy_tree(str(src), str(dst))
+
+  copied = sorted(str(p.relative_to(dst)) for p in dst.rglob('*') if p.is_file())
+  assert copied == ['a.txt', 'nested/b.txt', 'nested/deeper/c.txt']
+  for rel_path in copied:
+    assert (dst / rel_path).read_bytes() == (src / rel_path).read_bytes()
+    assert (dst / rel_path).stat().st_mtime == (src / rel_path).stat().st_mtime
@@ -187,9 +187,13 @@ export class DatasetsService {
     /**
      * Select Groups
      * Select groups from the dataset database.
+     *
+     * Returns JSON by default, or an Arrow IPC stream when the `Accept` header includes
+     * `application/vnd.apache.arrow.stream`.
      * @param namespace
      * @param datasetName
      * @param requestBody
+     * @param accept
      * @returns SelectGroupsResult Successful Response
      * @throws ApiError
      */
@@ -197,6 +201,7 @@ export class DatasetsService {
         namespace: string,
         datasetName: string,
         requestBody: SelectGroupsOptions,
+        accept?: (string | null),
     ): CancelablePromise<SelectGroupsResult> {
         return __request(OpenAPI, {
             method: 'POST',
@@ -205,6 +210,9 @@ export class DatasetsService {
                 'namespace': namespace,
                 'dataset_name': datasetName,
             },
+            headers: {
+                'accept': accept,
+            },
             body: requestBody,
             mediaType: 'application/json',
             errors: {